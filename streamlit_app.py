@@ -1,6 +1,12 @@
 
 import os
+import random
+import re
+import time
 from datetime import datetime, timezone
+from itertools import groupby
+from types import SimpleNamespace
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -10,20 +16,26 @@ from google.oauth2.service_account import Credentials
 
 # Fuzzy matching (optional)
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
     HAS_RAPIDFUZZ = True
 except Exception:
     HAS_RAPIDFUZZ = False
 
 st.set_page_config(page_title="BD Day – Contact Lockout", page_icon="📞", layout="wide")
 st.title("📞 BD Day – Contact Lockout")
-st.caption("Lock before you dial. Everyone sees locks instantly across brands. Duplicate checks: exact email/phone and fuzzy company (optional).")
+st.caption("Lock before you dial. Locks show up for every brand within seconds (a few minutes if Google is slow) and are re-checked against the live sheet before saving. Duplicate checks: exact email/phone and fuzzy company (exact company if fuzzy matching is unavailable).")
 
 # ----------------------------
 # Constants & helpers
 # ----------------------------
-BRANDS = ["Dartmouth Partners", "Catalyst Partners", "Pure Search", "Other"]
+BRANDS = ("Dartmouth Partners", "Catalyst Partners", "Pure Search", "Other")
+HEADERS = ("Timestamp", "Date", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes")
 FUZZY_THRESHOLD = 82  # fixed
+FUZZY_MIN_LEN = 4  # while typing, shorter company inputs only get an exact match
+TODAY_VIEW_LIMIT = 200  # rows sent to the browser per rerun
+REVISION_MAX_AGE = 300  # seconds; safety bound on a cached read when modifiedTime lags
+FALLBACK_MAX_AGE = 30  # seconds; plain time bucket when Drive metadata is unavailable
+_NON_DIGITS_RE = re.compile(r"\D+")
 
 def now_in_tz(tz="Europe/London"):
     try:
@@ -41,15 +53,7 @@ def normalize_text(x: str) -> str:
 def normalize_phone(p: str) -> str:
     if not p:
         return ""
-    return "".join(ch for ch in str(p) if ch.isdigit())
-
-def email_domain(email: str) -> str:
-    if not email:
-        return ""
-    e = str(email).strip().lower()
-    if "@" in e:
-        return e.split("@", 1)[1]
-    return ""
+    return _NON_DIGITS_RE.sub("", str(p))
 
 def get_qp(key: str) -> str:
     try:
@@ -152,10 +156,35 @@ def get_credentials():
         return Credentials.from_service_account_file("service_account.json", scopes=scopes)
     raise RuntimeError("No credentials found. Add Streamlit secret `gcp_service_account` or upload service_account.json.")
 
+# One authorized client per process: its AuthorizedSession keeps the TLS connection
+# and OAuth token alive across every sheet opened, instead of per open_sheet miss.
+@st.cache_resource(show_spinner=False)
 def get_gspread_client():
     creds = get_credentials()
     return gspread.authorize(creds)
 
+def create_tab_with_header(sh, title):
+    # addSheet + header row in a single (atomic) batchUpdate; addSheet accepts a
+    # caller-chosen sheetId so the updateCells request can target the new tab.
+    sheet_id = random.randrange(1, 2**31 - 1)
+    try:
+        res = sh.batch_update({"requests": [
+            {"addSheet": {"properties": {
+                "sheetId": sheet_id, "title": title, "sheetType": "GRID",
+                "gridProperties": {"rowCount": 4000, "columnCount": 12},
+            }}},
+            {"updateCells": {
+                "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                "rows": [{"values": [{"userEnteredValue": {"stringValue": h}} for h in HEADERS]}],
+                "fields": "userEnteredValue",
+            }},
+        ]})
+        return gspread.Worksheet(sh, res["replies"][0]["addSheet"]["properties"], sh.id, sh.client)
+    except gspread.exceptions.APIError:
+        ws = sh.add_worksheet(title=title, rows=4000, cols=12)
+        ws.update(values=[list(HEADERS)], range_name="A1:I1")
+        return ws
+
 @st.cache_resource(show_spinner=False)
 def open_sheet(url: str):
     gc = get_gspread_client()
@@ -163,10 +192,83 @@ def open_sheet(url: str):
     try:
         ws = sh.worksheet("Locks")
     except gspread.WorksheetNotFound:
-        ws = sh.add_worksheet(title="Locks", rows=4000, cols=12)
-        ws.update("A1:I1", [["Timestamp", "Date", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes"]])
+        ws = create_tab_with_header(sh, "Locks")
     return ws, sh
 
+# Cheap Drive metadata call that keys the full read below: while modifiedTime is
+# unchanged, a rerun costs only this call (at most once per 10s) and no sheet read.
+# Without modifiedTime (e.g. Drive API not enabled) the read falls back to a 30s bucket.
+@st.cache_resource(show_spinner=False)
+def drive_metadata_backoff():
+    return {"until": 0.0}
+
+@st.cache_data(ttl=10, show_spinner=False)
+def sheet_revision(url: str) -> str:
+    backoff = drive_metadata_backoff()
+    modified = ""
+    if time.time() >= backoff["until"]:
+        _, sh = open_sheet(url)
+        try:
+            modified = sh.get_lastUpdateTime()
+        except Exception:
+            # Don't retry a failing call on every 10s refresh
+            backoff["until"] = time.time() + REVISION_MAX_AGE
+    if not modified:
+        return f"|{int(time.time() // FALLBACK_MAX_AGE)}"
+    return f"{modified}|{int(time.time() // REVISION_MAX_AGE)}"
+
+# Cached per revision, so any write must call invalidate_locks(); the shared (df, idx) is read-only.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_locks_df(url: str, revision: str):
+    ws, _ = open_sheet(url)
+    # FORMATTED_VALUE on purpose: UNFORMATTED would turn the dates into serial numbers
+    rows = ws.get("A2:I", pad_values=True)
+    if not any(rows):
+        rows = []  # header-only sheet: gspread returns [[]] when the range has no values
+    df = pd.DataFrame(rows).reindex(columns=range(len(HEADERS)), fill_value="")
+    df.columns = list(HEADERS)
+    if not df.empty:
+        # Fast path for the format we write; infer only for rows Sheets re-rendered differently
+        ts = pd.to_datetime(df["Timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+        retry = ts.isna() & (df["Timestamp"] != "")
+        if retry.any():
+            ts[retry] = pd.to_datetime(df.loc[retry, "Timestamp"], errors="coerce")
+        df["Timestamp"] = ts
+        # Newest first once per load so hit lists and the today view need no per-rerun sort
+        df = df.sort_values("Timestamp", ascending=False, kind="stable", ignore_index=True)
+        # Vectorized equivalents of normalize_text / normalize_phone
+        df["_company_n"] = df["Company"].str.lower().str.split().str.join(" ")
+        df["_email_n"] = df["Email"].str.lower().str.split().str.join(" ")
+        df["_phone_n"] = df["Phone"].str.replace(_NON_DIGITS_RE, "", regex=True)
+        # Only low-cardinality columns as category; the near-unique match keys stay object
+        df["Date"] = df["Date"].astype("category")
+        # Known brands first for stable codes/order; keep any legacy values rather than NaN them
+        df["Brand"] = pd.Categorical(df["Brand"], categories=list(dict.fromkeys([*BRANDS, *df["Brand"].unique()])))
+    else:
+        df = pd.DataFrame(columns=[*HEADERS, "_company_n", "_email_n", "_phone_n"])
+    idx = SimpleNamespace(
+        version=time.time_ns(),  # changes only when the sheet is actually re-read
+        email=df.groupby("_email_n", observed=True).indices,
+        phone=df.groupby("_phone_n", observed=True).indices,
+        company=df.groupby("_company_n", observed=True).indices,
+        date=df.groupby("Date", observed=True).indices,  # today's slice without a full-column scan
+    )
+    # Blank cells are never a match; drop their (often largest) position arrays.
+    for positions_by_key in (idx.email, idx.phone, idx.company):
+        positions_by_key.pop("", None)
+    # token_set_ratio ignores token order/repeats, so score each canonical token set once
+    canon = {}
+    for c, positions in idx.company.items():
+        canon.setdefault(" ".join(sorted(set(c.split()))), []).append(positions)
+    idx.company_canon = {k: np.concatenate(v) for k, v in canon.items()}
+    idx.companies = list(idx.company_canon)  # fuzzy candidates, built once per load
+    return df, idx
+
+def invalidate_locks():
+    # Drive's modifiedTime can lag a Sheets write, so drop the data too, not just the revision
+    sheet_revision.clear()
+    load_locks_df.clear()
+
 # ----------------------------
 # Session state init
 # ----------------------------
@@ -228,19 +330,7 @@ except Exception as e:
     st.error(f"Could not open sheet. Check URL, sharing and credentials. Details: {e}")
     st.stop()
 
-rows = ws.get_all_records()
-df = pd.DataFrame(rows, columns=["Timestamp", "Date", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes"])
-if not df.empty:
-    df["Timestamp"] = pd.to_datetime(df["Timestamp"], errors="coerce")
-    df["_company_n"] = df["Company"].astype(str).apply(normalize_text)
-    df["_email_n"] = df["Email"].astype(str).apply(normalize_text)
-    df["_domain"] = df["Email"].astype(str).apply(email_domain)  # kept for info, not used for duplicates
-    df["_phone_n"] = df["Phone"].astype(str).apply(normalize_phone)
-else:
-    df = pd.DataFrame(columns=[
-        "Timestamp", "Date", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes",
-        "_company_n", "_email_n", "_domain", "_phone_n"
-    ])
+df, idx = load_locks_df(sheet_url, sheet_revision(sheet_url))
 
 # ----------------------------
 # Admin actions
@@ -249,100 +339,152 @@ def get_or_create_archive(sh):
     try:
         arch = sh.worksheet("Archive")
     except gspread.WorksheetNotFound:
-        arch = sh.add_worksheet(title="Archive", rows=4000, cols=12)
-        arch.update("A1:I1", [["Timestamp", "Date", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes"]])
+        arch = create_tab_with_header(sh, "Archive")
     return arch
 
-def admin_clear_today():
+def row_runs(row_numbers):
+    # Contiguous runs of 1-based row numbers as (first, last) pairs, ascending.
+    runs = []
+    for _, group in groupby(enumerate(sorted(row_numbers)), key=lambda p: p[1] - p[0]):
+        rows = [r for _, r in group]
+        runs.append((rows[0], rows[-1]))
+    return runs
+
+def delete_rows_batch(ws, row_numbers):
+    # One batchUpdate with a deleteDimension per contiguous run of 1-based rows,
+    # applied bottom-up so earlier deletions don't shift later ranges.
+    requests = [
+        {"deleteDimension": {"range": {
+            "sheetId": ws.id, "dimension": "ROWS", "startIndex": first - 1, "endIndex": last,
+        }}}
+        for first, last in row_runs(row_numbers)
+    ]
+    if requests:
+        ws.spreadsheet.batch_update({"requests": requests[::-1]})
+
+def today_row_numbers(ws, today_str):
+    # Address rows by position from a fresh read of the Date column alone (B2:B),
+    # not from the cached frame, which may be older than the sheet.
+    dates = ws.get("B2:B")
+    return [r for r, row in enumerate(dates, start=2) if row and row[0] == today_str]
+
+def admin_clear_today(ws, tz_name):
     today_str = now_in_tz(tz_name).strftime("%Y-%m-%d")
-    values = ws.get_all_values()
-    to_delete = []
-    for idx, row in enumerate(values[1:], start=2):
-        if len(row) >= 2 and row[1] == today_str:
-            to_delete.append(idx)
+    to_delete = today_row_numbers(ws, today_str)
     if not to_delete:
         return "No rows for today to delete."
-    for r in reversed(to_delete):
-        ws.delete_rows(r)
+    delete_rows_batch(ws, to_delete)
     return f"Deleted {len(to_delete)} row(s) for today ({today_str})."
 
-def admin_clear_all():
-    ws.delete_rows(2, ws.row_count)
+def admin_clear_all(ws, sh):
+    # ws is shared across sessions by open_sheet, so its row_count can be stale (other
+    # processes append, batched deletes don't update it); fetch the current grid size.
+    row_count = sh.worksheet(ws.title).row_count
+    if row_count < 2:
+        return "No data rows to clear."
+    ws.delete_rows(2, row_count)
     return "All locks cleared (header preserved)."
 
-def admin_archive_today_and_clear():
+def admin_archive_today_and_clear(ws, sh, tz_name):
     today_str = now_in_tz(tz_name).strftime("%Y-%m-%d")
-    values = ws.get_all_values()
-    rows_to_archive = []
-    row_numbers = []
-    for idx, row in enumerate(values[1:], start=2):
-        if len(row) >= 2 and row[1] == today_str:
-            rows_to_archive.append(row[:9])
-            row_numbers.append(idx)
-    if not rows_to_archive:
+    row_numbers = today_row_numbers(ws, today_str)
+    if not row_numbers:
         return "No rows for today to archive."
+    # Raw cell values for just today's rows (one range per contiguous run), so
+    # the archive gets exactly what the sheet holds rather than parsed values.
+    ranges = [f"A{first}:I{last}" for first, last in row_runs(row_numbers)]
+    rows_to_archive = [row for vr in ws.batch_get(ranges) for row in vr]
     arch = get_or_create_archive(sh)
     arch.append_rows(rows_to_archive, value_input_option="USER_ENTERED")
-    for r in reversed(row_numbers):
-        ws.delete_rows(r)
+    delete_rows_batch(ws, row_numbers)
     return f"Archived and cleared {len(rows_to_archive)} row(s) for today ({today_str})."
 
-def admin_archive_all_and_clear():
+def admin_archive_all_and_clear(ws, sh):
     values = ws.get_all_values()
     if len(values) <= 1:
         return "No data rows to archive."
-    data_rows = [row[:9] for row in values[1:]]
+    data_rows = [row[:len(HEADERS)] for row in values[1:]]
     arch = get_or_create_archive(sh)
     arch.append_rows(data_rows, value_input_option="USER_ENTERED")
-    ws.delete_rows(2, ws.row_count)
+    # Delete only the rows just archived, not up to the (possibly stale) cached row_count
+    ws.delete_rows(2, len(values))
     return f"Archived and cleared {len(data_rows)} row(s)."
 
 if is_admin:
-    if 'reset_today' in locals() and reset_today:
-        st.success(admin_clear_today()); st.rerun()
-    if 'reset_all' in locals() and reset_all:
-        st.success(admin_clear_all()); st.rerun()
-    if 'archive_today' in locals() and archive_today:
-        st.success(admin_archive_today_and_clear()); st.rerun()
-    if 'archive_all' in locals() and archive_all:
-        st.success(admin_archive_all_and_clear()); st.rerun()
+    admin_msg = None
+    if reset_today:
+        admin_msg = admin_clear_today(ws, tz_name)
+    elif reset_all:
+        admin_msg = admin_clear_all(ws, sh)
+    elif archive_today:
+        admin_msg = admin_archive_today_and_clear(ws, sh, tz_name)
+    elif archive_all:
+        admin_msg = admin_archive_all_and_clear(ws, sh)
+    if admin_msg:
+        st.success(admin_msg)
+        invalidate_locks()
+        st.rerun()
 
 # ----------------------------
 # Duplicate finder (NO domain duplicate flag)
 # ----------------------------
-def find_duplicates(df, company_n, email_n, phone_n):
+def find_duplicates(df, idx, company_n, email_n, phone_n, fuzzy=True):
+    # fuzzy=False (or no rapidfuzz) checks the company by exact match only.
     hits = []
-    if df.empty:
+    hit_positions = []
+    if df.empty or not (company_n or email_n or phone_n):
         return hits, pd.DataFrame(columns=df.columns)
     if email_n:
-        exact_email = df[df["_email_n"] == email_n]
-        if not exact_email.empty:
-            hits.append(("Exact email", exact_email))
+        positions = idx.email.get(email_n)
+        if positions is not None:
+            hits.append(("Exact email", df.iloc[positions]))
+            hit_positions.append(positions)
     if phone_n:
-        exact_phone = df[df["_phone_n"] == phone_n]
-        if not exact_phone.empty:
-            hits.append(("Exact phone", exact_phone))
-    if company_n and HAS_RAPIDFUZZ:
-        uniq_companies = df["_company_n"].dropna().unique().tolist()
-        matched_vals = []
-        for comp in uniq_companies:
-            if not comp:
-                continue
-            score = fuzz.token_set_ratio(company_n, comp)
-            if score >= FUZZY_THRESHOLD:
-                matched_vals.append(comp)
-        if matched_vals:
-            fuzzy_df = df[df["_company_n"].isin(set(matched_vals))]
-            if not fuzzy_df.empty:
-                hits.append((f"Fuzzy company ≥{FUZZY_THRESHOLD}", fuzzy_df))
+        positions = idx.phone.get(phone_n)
+        if positions is not None:
+            hits.append(("Exact phone", df.iloc[positions]))
+            hit_positions.append(positions)
+    if company_n and fuzzy and HAS_RAPIDFUZZ:
+        matches = process.extract(
+            company_n, idx.companies,
+            scorer=fuzz.token_set_ratio, score_cutoff=FUZZY_THRESHOLD, limit=None,
+        )
+        if matches:
+            positions = np.sort(np.concatenate([idx.company_canon[m[0]] for m in matches]))
+            hits.append((f"Fuzzy company ≥{FUZZY_THRESHOLD}", df.iloc[positions]))
+            hit_positions.append(positions)
+    elif company_n:
+        positions = idx.company.get(company_n)
+        if positions is not None:
+            hits.append(("Exact company", df.iloc[positions]))
+            hit_positions.append(positions)
     if hits:
-        parts = [h[1] for h in hits]
-        combined = pd.concat(parts, axis=0).drop_duplicates()
-        combined = combined.sort_values("Timestamp", ascending=False)
+        # Every hit is a subset of df, so union row positions instead of hashing whole rows;
+        # ascending positions are already newest first
+        combined = df.iloc[np.unique(np.concatenate(hit_positions))]
     else:
         combined = pd.DataFrame(columns=df.columns)
     return hits, combined
 
+def find_duplicates_memo(df, idx, company_n, email_n, phone_n, fuzzy=True):
+    # For the live panel: a full-script rerun (filters, sidebar, form buttons) re-renders
+    # it with the same inputs, so reuse the last result while the loaded data
+    # (idx.version) and the normalized inputs are unchanged.
+    key = (idx.version, company_n, email_n, phone_n, fuzzy)
+    memo = st.session_state.get("_dup_memo")
+    if memo is None or memo[0] != key:
+        memo = (key, find_duplicates(df, idx, company_n, email_n, phone_n, fuzzy))
+        st.session_state["_dup_memo"] = memo
+    return memo[1]
+
+def with_signals(hits, combined):
+    # One table for all signals: a row hit by several shows once, labelled with each
+    signal = pd.concat([pd.Series(label, index=sub.index) for label, sub in hits])
+    signal = signal.groupby(level=0, sort=False).agg(", ".join)
+    return combined.assign(Signal=signal)[
+        ["Signal", "Timestamp", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes"]
+    ]
+
 # ----------------------------
 # Pre-render form clear (IMPORTANT: before widgets)
 # ----------------------------
@@ -355,25 +497,23 @@ def request_clear_form():
     st.session_state["_do_clear_form"] = True
 
 # ----------------------------
-# Main form layout: two columns
+# Main form layout: live duplicate panel + lock form
 # ----------------------------
 st.subheader("Lock a Contact")
 
-with st.form("lock_form", clear_on_submit=False):
+# Company/Email/Phone live outside the form inside a fragment, so editing them
+# reruns only the duplicate check instead of the whole script.
+@st.fragment
+def _dup_panel():
+    # Load here, not via arguments: a fragment rerun reuses the last full run's arguments
+    df, idx = load_locks_df(sheet_url, sheet_revision(sheet_url))
     live_alert = st.empty()
     left, right = st.columns([1.3, 1])
 
     with left:
-        company = st.text_input("Company *", key="company")
-        contact_name = st.text_input("Contact Name *", key="contact_name")
-        email = st.text_input("Email (recommended)", key="email")
-        phone = st.text_input("Phone", key="phone")
-        notes = st.text_area("Notes (optional)", height=72, key="notes")
-
-        st.markdown(" ")
-        if st.form_submit_button("🧽 Clear form (Company/Contact/Email/Phone/Notes)"):
-            request_clear_form()
-            st.rerun()
+        st.text_input("Company *", key="company")
+        st.text_input("Email (recommended)", key="email")
+        st.text_input("Phone", key="phone")
 
     with right:
         st.markdown("**Match Signals**")
@@ -381,22 +521,33 @@ with st.form("lock_form", clear_on_submit=False):
         check_email = normalize_text(st.session_state["email"])
         check_phone = normalize_phone(st.session_state["phone"])
 
-        live_hits, live_combined = find_duplicates(df, check_company, check_email, check_phone)
+        # Short partial names ("D", "Da"...) only get an exact company match while typing;
+        # the submit guard always runs the full fuzzy check.
+        live_hits, live_combined = find_duplicates_memo(
+            df, idx, check_company, check_email, check_phone,
+            fuzzy=len(check_company) >= FUZZY_MIN_LEN,
+        )
 
         if live_hits:
             st.error("⚠ Potential duplicate(s) detected while typing. Review below.")
-            for label, sub in live_hits:
-                st.markdown(f"**{label}**")
-                st.dataframe(
-                    sub[["Timestamp", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes"]].sort_values("Timestamp", ascending=False),
-                    use_container_width=True
-                )
+            st.dataframe(with_signals(live_hits, live_combined), use_container_width=True)
         else:
             st.success("✅ No duplicates found yet on company/email/phone checks.")
 
     if live_hits:
         live_alert.error("🚨 Potential duplicate(s) detected based on what you've typed. Please review before locking.")
 
+_dup_panel()
+
+with st.form("lock_form", clear_on_submit=False):
+    contact_name = st.text_input("Contact Name *", key="contact_name")
+    notes = st.text_area("Notes (optional)", height=72, key="notes")
+
+    st.markdown(" ")
+    if st.form_submit_button("🧽 Clear form (Company/Contact/Email/Phone/Notes)"):
+        request_clear_form()
+        st.rerun()
+
     submitted = st.form_submit_button("🔒 Lock Contact")
 
     if submitted:
@@ -417,8 +568,13 @@ with st.form("lock_form", clear_on_submit=False):
         elif not email and not phone:
             st.warning("Please provide at least an Email or a Phone number.")
         else:
+            # Final guard before writing: re-read so a lock another user made since this
+            # session's load (possibly not yet in Drive's modifiedTime) is checked too.
+            invalidate_locks()
+            df, idx = load_locks_df(sheet_url, sheet_revision(sheet_url))
             hits, combined = find_duplicates(
                 df,
+                idx,
                 normalize_text(company),
                 normalize_text(email),
                 normalize_phone(phone),
@@ -428,13 +584,10 @@ with st.form("lock_form", clear_on_submit=False):
             if hits and (st.session_state.get("confirm_sig") != sig or not st.session_state.get("confirm_ready", False)):
                 st.session_state["confirm_sig"] = sig
                 st.session_state["confirm_ready"] = True
-                st.error("⚠ Potential duplicate(s) detected — please review the matches on the right. "
+                st.error("⚠ Potential duplicate(s) detected — please review the matches shown above. "
                          "If you still want to proceed, click **Lock Contact** again to confirm.")
                 if not combined.empty:
-                    st.dataframe(
-                        combined[["Timestamp", "Company", "Contact Name", "Email", "Phone", "Brand", "Locked By", "Notes"]],
-                        use_container_width=True
-                    )
+                    st.dataframe(with_signals(hits, combined), use_container_width=True)
             else:
                 try:
                     ts = now_in_tz(tz_name)
@@ -445,6 +598,7 @@ with st.form("lock_form", clear_on_submit=False):
                         email.strip(), phone.strip(), brand, locked_by.strip(), notes.strip()
                     ]
                     ws.append_row(new_row, value_input_option="USER_ENTERED")
+                    invalidate_locks()
                     st.success("Contact locked for today. Visible to all teams now.")
                     st.session_state["confirm_sig"] = None
                     st.session_state["confirm_ready"] = False
@@ -470,38 +624,43 @@ with st.expander("Filters", expanded=True):
 
 if not df.empty:
     today_str = now_in_tz(tz_name).strftime("%Y-%m-%d")
-    today_df = df[df["Date"] == today_str].copy()
-
-    if q_company:
-        qn = normalize_text(q_company)
-        today_df = today_df[today_df["_company_n"].str.contains(qn, na=False)]
-    if q_email:
-        qn = normalize_text(q_email)
-        today_df = today_df[today_df["_email_n"].str.contains(qn, na=False)]
+    today_df = df.iloc[idx.date.get(today_str, [])].copy()
+
+    # Filters run on today's slice only; the key columns are object, so .str work scales with it
+    qn = normalize_text(q_company)
+    if qn:
+        today_df = today_df[today_df["_company_n"].str.contains(qn, na=False, regex=False)]
+    qn = normalize_text(q_email)
+    if qn:
+        today_df = today_df[today_df["_email_n"].str.contains(qn, na=False, regex=False)]
     if brand_filter:
         today_df = today_df[today_df["Brand"].isin(brand_filter)]
-    if q_phone:
-        qn = normalize_phone(q_phone)
-        today_df = today_df[today_df["_phone_n"].str.contains(qn, na=False)]
+    qn = normalize_phone(q_phone)
+    if qn:
+        today_df = today_df[today_df["_phone_n"].str.contains(qn, na=False, regex=False)]
 
     if not today_df.empty:
-        today_df["Dup Today?"] = (
-            today_df.duplicated(subset=["_email_n"], keep="first") |
-            today_df.duplicated(subset=["_phone_n"], keep="first") |
-            today_df.duplicated(subset=["_company_n"], keep="first")
-        )
+        # Later repeats of a non-empty key; rows merely missing an email/phone aren't dups.
+        # Rows are newest first, so count from the end to leave the earliest lock unflagged.
+        dup = pd.Series(False, index=today_df.index)
+        for c in ("_email_n", "_phone_n", "_company_n"):
+            dup |= today_df.groupby(c, observed=True).cumcount(ascending=False).gt(0) & today_df[c].ne("")
+        today_df["Dup Today?"] = dup
 
         # Build safe display columns (no Email/Phone) and ensure 'Dup Today?' exists
     if 'Dup Today?' not in today_df.columns:
         today_df['Dup Today?'] = False
     desired = ["Timestamp","Company","Contact Name","Brand","Locked By","Notes","Dup Today?"]
     display_cols = [c for c in desired if c in today_df.columns]
-    st.dataframe(
-        today_df[display_cols].sort_values("Timestamp", ascending=False),
-        use_container_width=True
-    )
+    view = today_df[display_cols]
+    st.dataframe(view.head(TODAY_VIEW_LIMIT), use_container_width=True)
+    if len(view) > TODAY_VIEW_LIMIT:
+        st.caption(f"Showing the latest {TODAY_VIEW_LIMIT} of {len(view)} rows. Use the filters to narrow down.")
 else:
     st.info("No locks yet.")
 
 st.markdown("---")
-st.caption(f"Signals used: exact email/phone and fuzzy company match (threshold {FUZZY_THRESHOLD}).")
+st.caption(
+    f"Signals used: exact email/phone and fuzzy company match (threshold {FUZZY_THRESHOLD}); "
+    f"while typing, company names under {FUZZY_MIN_LEN} characters get an exact match only."
+)